@@ -0,0 +1,52 @@
+"""Detection-latency benchmark for the complement-arbitrage scanner.
+
+Run with `python benchmarks/bench_arbitrage.py [markets] [updates] [depth]`.
+"""
+from __future__ import annotations
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tracker.arbitrage import ComplementArbitrageScanner  # noqa: E402
+
+
+def _random_book(rng: random.Random, depth: int) -> dict:
+    mid = rng.uniform(0.2, 0.8)
+    return {
+        "bids": [{"price": f"{mid - 0.01 * (k + 1):.2f}", "size": str(rng.randint(1, 500))} for k in range(depth)],
+        "asks": [{"price": f"{mid + 0.01 * k:.2f}", "size": str(rng.randint(1, 500))} for k in range(depth)],
+    }
+
+
+def main(markets: int = 200, updates: int = 50_000, depth: int = 20) -> None:
+    rng = random.Random(42)
+    scanner = ComplementArbitrageScanner()
+    for i in range(markets):
+        scanner.track_pair(f"m{i}", f"a{i}", f"b{i}")
+
+    books = [_random_book(rng, depth) for _ in range(256)]
+    latencies: list[float] = []
+    for n in range(updates):
+        market = rng.randrange(markets)
+        token = f"a{market}" if n % 2 else f"b{market}"
+        received = time.perf_counter_ns()
+        scanner.on_book_update(token, books[n % len(books)], received_ns=received)
+        latencies.append((time.perf_counter_ns() - received) / 1_000_000)
+
+    latencies.sort()
+    print(f"markets={markets} updates={updates} depth={depth} opportunities={scanner.opportunities.qsize()}")
+    print(
+        "receive->detect ms: "
+        f"p50={statistics.median(latencies):.4f} "
+        f"p99={latencies[int(len(latencies) * 0.99)]:.4f} "
+        f"max={latencies[-1]:.4f}"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
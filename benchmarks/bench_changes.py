@@ -0,0 +1,139 @@
+"""What change detection saves on a quiet window.
+
+1. Recorder/serialization: `ticks` synthetic refreshes where the book only
+   moves every `change_every` ticks, comparing "serialize and store every
+   tick" with fingerprint + `DeltaRecorder`. This is pipeline-only; it does
+   not describe the dashboard.
+2. Dashboard render path (needs Streamlit): `reruns` timed `AppTest` reruns
+   of `dashboard.py` against the mock API with a frozen book vs a moving one.
+   The dashboard renders every element on each run either way; this shows
+   the rerun cost does not depend on whether the book moved.
+
+Run with `python benchmarks/bench_changes.py [ticks] [change_every] [reruns]`.
+"""
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from tracker.changes import ChangeDetector, DeltaRecorder, event_fingerprint  # noqa: E402
+from tracker.models import OrderBookSnapshot  # noqa: E402
+
+
+def _event(step: int) -> dict:
+    bid = 0.40 + 0.01 * (step % 10)
+    snaps = [
+        OrderBookSnapshot("a", 0.5, bid, bid + 0.02, bid + 0.01, 0.02),
+        OrderBookSnapshot("b", 0.5, 0.58 - 0.01 * (step % 10), 0.60, 0.59, 0.02),
+    ]
+    return {
+        "event_title": "BTC Up or Down",
+        "market_question": "?",
+        "labels": ["Up", "Down"],
+        "tokens": ["a", "b"],
+        "mid_probabilities": [snaps[0].mid_price_probability, snaps[1].mid_price_probability],
+        "snapshots": snaps,
+    }
+
+
+def _serialize(data: dict) -> str:
+    # Stand-in for serializing a refresh for storage/transport.
+    return json.dumps({**data, "snapshots": [s.__dict__ for s in data["snapshots"]]}, sort_keys=True, indent=2)
+
+
+def bench_recorder(ticks: int, change_every: int) -> None:
+    events = [_event(i // change_every) for i in range(ticks)]
+
+    full_log = io.StringIO()
+    start = time.process_time()
+    for i, data in enumerate(events):
+        _serialize(data)
+        DeltaRecorder(full_log, keyframe_interval=0).record("s", data["snapshots"], timestamp=float(i))
+    naive_cpu = time.process_time() - start
+
+    delta_log = io.StringIO()
+    detector = ChangeDetector()
+    recorder = DeltaRecorder(delta_log)
+    start = time.process_time()
+    for i, data in enumerate(events):
+        if detector.changed("s", event_fingerprint(data)):
+            _serialize(data)
+            recorder.record("s", data["snapshots"], timestamp=float(i))
+    detect_cpu = time.process_time() - start
+
+    print(f"[recorder] ticks={ticks} change_every={change_every} published={detector.published} suppressed={detector.suppressed}")
+    print(f"[recorder] serialization cpu: always={naive_cpu * 1000:.1f}ms change-detected={detect_cpu * 1000:.1f}ms ({naive_cpu / detect_cpu:.1f}x)")
+    full_bytes, delta_bytes = len(full_log.getvalue()), len(delta_log.getvalue())
+    print(f"[recorder] storage: full={full_bytes}B delta+keyframes={delta_bytes}B ({full_bytes / delta_bytes:.1f}x)")
+
+
+def _time_dashboard_reruns(reruns: int, *, static: bool) -> list[float]:
+    from mock_api import MockPolymarketAPI
+    from streamlit.testing.v1 import AppTest
+
+    from tracker import service
+    from tracker.clock import period_bounds
+
+    server = MockPolymarketAPI(("127.0.0.1", 0), static=static)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    service._single_flight.freshness_seconds = 0.0  # every rerun must see the mock's current book
+    try:
+        os.environ["POLYMARKET_GAMMA_EVENTS_URL"] = f"{server.base_url}/events"
+        os.environ["POLYMARKET_CLOB_BOOK_URL"] = f"{server.base_url}/book"
+        # tracker.service bound the URLs at import; point it at this server.
+        service.GAMMA_EVENTS_URL = os.environ["POLYMARKET_GAMMA_EVENTS_URL"]
+        service.CLOB_BOOK_URL = os.environ["POLYMARKET_CLOB_BOOK_URL"]
+
+        app = AppTest.from_file(str(ROOT / "dashboard.py"), default_timeout=30)
+        app.session_state["auto_mode_enabled"] = True
+        app.session_state["base_slug"] = f"btc-updown-5m-{int(period_bounds(300)[0])}"
+        app.run()
+
+        cpu: list[float] = []
+        for _ in range(reruns):
+            start = time.process_time()
+            app.run()
+            cpu.append(time.process_time() - start)
+            if app.exception or len(app.metric) < 2:
+                raise RuntimeError("dashboard rerun did not render the probability metrics")
+        return cpu
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_dashboard(reruns: int) -> None:
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        print("[dashboard] skipped: streamlit is not installed")
+        return
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    quiet = _time_dashboard_reruns(reruns, static=True)
+    moving = _time_dashboard_reruns(reruns, static=False)
+    print(
+        f"[dashboard] cpu per rerun (median, includes mock API): "
+        f"quiet={statistics.median(quiet) * 1000:.2f}ms "
+        f"moving={statistics.median(moving) * 1000:.2f}ms"
+    )
+
+
+def main(ticks: int = 20_000, change_every: int = 50, reruns: int = 100) -> None:
+    bench_recorder(ticks, change_every)
+    bench_dashboard(reruns)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,455 @@
+"""Load test: one `streamlit run dashboard.py` server, N websocket viewers.
+
+The harness starts the local mock API and a headless Streamlit server for
+`dashboard.py`, each in its own process, then opens N websocket sessions
+against the server, speaking Streamlit's own protocol (protobuf `BackMsg` /
+`ForwardMsg`) like a browser tab would:
+
+1. run the page, fill in the current slug and click "Ligar Bot";
+2. pick up the fragment's `auto_rerun` (from `run_every`) and send the
+   same fragment reruns the frontend timer would, every `--interval`
+   seconds (default: the interval the server announces).
+
+All sessions share the server's `tracker` module state, so request
+coalescing across viewers is real. The report takes CPU and RSS from the
+server process (Linux `/proc`), upstream requests from the mock API, and
+fetch coalescing from the server's own `get_fetch_metrics` caption.
+Memory per session is the server's RSS at the end of the load window,
+with all sessions still connected, minus its RSS after a warm-up session
+has rendered and disconnected, divided by the connected sessions.
+
+A refresh counts as failed when the fragment run does not finish, shows
+`st.exception`/`st.error`, or is missing the event card or the two
+probability metrics. A session that cannot connect, start the bot, or
+dies mid-run counts as failed along with its missing refreshes. Failed
+refreshes are excluded from the latency percentiles.
+
+Caveats: the client does not announce cached message hashes, so the server
+sends every element in full (small overestimate of the per-refresh cost),
+and the N clients share one process, so at high N client-side scheduling
+shows up in the latencies.
+
+    python benchmarks/loadtest.py --sessions 50 --duration 60
+    python benchmarks/loadtest.py --sessions 50 --max-p95-ms 500 --max-upstream-rps 50
+
+Exits with status 1 when any session or refresh failed or a `--max-*`
+threshold is exceeded.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from urllib.error import URLError
+from urllib.request import urlopen
+
+ROOT = Path(__file__).resolve().parents[1]
+DASHBOARD = ROOT / "dashboard.py"
+sys.path.insert(0, str(ROOT))
+
+FETCH_CAPTION = "fetch: "
+
+
+def _proc_cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as stat:
+        # Fields after the parenthesised command name; utime/stime are 14/15.
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _proc_rss_bytes(pid: int) -> int:
+    with open(f"/proc/{pid}/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _api_stats(base_url: str) -> dict:
+    with urlopen(f"{base_url}/__stats", timeout=5) as response:
+        return json.loads(response.read())
+
+
+def _start_mock_api(port: int, latency_ms: float) -> tuple[subprocess.Popen, str]:
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / "benchmarks" / "mock_api.py"), "--port", str(port), "--latency-ms", str(latency_ms)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = proc.stdout.readline().strip() if proc.stdout else ""
+    if not line.startswith("mock API on "):
+        proc.kill()
+        raise RuntimeError(f"mock API failed to start: {line!r}")
+    return proc, line.removeprefix("mock API on ")
+
+
+def _start_dashboard(port: int, api_url: str, log: Any, timeout: float) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        POLYMARKET_GAMMA_EVENTS_URL=f"{api_url}/events",
+        POLYMARKET_CLOB_BOOK_URL=f"{api_url}/book",
+    )
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", str(DASHBOARD),
+            "--global.developmentMode", "false",
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+            "--logger.level", "error",
+        ],
+        cwd=ROOT,
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"dashboard server exited with status {proc.returncode}")
+        try:
+            with urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return proc
+        except (URLError, OSError):
+            pass
+        time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"dashboard server did not become healthy within {timeout}s")
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class _Session:
+    """One viewer: a websocket to the server replaying what the frontend sends."""
+
+    def __init__(self, index: int, url: str, slug: str, timeout: float) -> None:
+        self.index = index
+        self.url = url
+        self.slug = slug
+        self.timeout = timeout
+        self.fragment_id: str | None = None
+        self.auto_interval: float | None = None
+        self.fetch_metrics: dict[str, int] | None = None
+        self._widgets: dict[str, Any] = {}
+        self._ws: Any = None
+
+    async def open(self) -> None:
+        import websockets
+
+        self._ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        status, elements = await self._run()
+        if status != "FINISHED_SUCCESSFULLY":
+            raise RuntimeError(f"first run ended with {status}")
+        self._find_widgets(elements)
+        if not {"slug", "start"} <= self._widgets.keys():
+            raise RuntimeError("slug input or 'Ligar Bot' button not rendered")
+
+        status, elements = await self._run(click_start=True)
+        failure = self._check(status, elements, "FINISHED_SUCCESSFULLY")
+        if failure:
+            raise RuntimeError(f"starting the bot failed: {failure}")
+        self._find_widgets(elements)
+        if self.fragment_id is None:
+            raise RuntimeError("server did not schedule the live panel fragment")
+
+    async def refresh(self) -> str | None:
+        """Rerun the live panel fragment; return a failure reason, or None when it rendered."""
+        status, elements = await self._run(fragment_id=self.fragment_id)
+        return self._check(status, elements, "FINISHED_FRAGMENT_RUN_SUCCESSFULLY")
+
+    async def close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+
+    async def _run(self, *, click_start: bool = False, fragment_id: str | None = None) -> tuple[str, list[tuple[str, Any]]]:
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        back = BackMsg()
+        state = back.rerun_script
+        state.query_string = ""
+        state.page_script_hash = ""
+        if fragment_id:
+            state.fragment_id = fragment_id
+            state.is_auto_rerun = True
+        if "slug" in self._widgets:
+            state.widget_states.widgets.add(id=self._widgets["slug"], string_value=self.slug)
+        if "use_mid" in self._widgets:
+            state.widget_states.widgets.add(id=self._widgets["use_mid"], bool_value=True)
+        if click_start:
+            state.widget_states.widgets.add(id=self._widgets["start"], trigger_value=True)
+        await self._ws.send(back.SerializeToString())
+
+        elements: list[tuple[str, Any]] = []
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await asyncio.wait_for(self._ws.recv(), self.timeout))
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                elements.append((element_type, getattr(element, element_type)))
+            elif kind == "auto_rerun":
+                self.fragment_id = msg.auto_rerun.fragment_id
+                self.auto_interval = msg.auto_rerun.interval
+            elif kind == "script_finished":
+                status = ForwardMsg.ScriptFinishedStatus.Name(msg.script_finished)
+                if status != "FINISHED_EARLY_FOR_RERUN":
+                    return status, elements
+                elements = []  # st.rerun(): the next run replaces this one
+
+    def _find_widgets(self, elements: list[tuple[str, Any]]) -> None:
+        for element_type, element in elements:
+            if element_type == "text_input" and element.label.startswith("Slug inicial"):
+                self._widgets["slug"] = element.id
+            elif element_type == "button" and "Ligar Bot" in element.label:
+                self._widgets["start"] = element.id
+            elif element_type == "checkbox" and element.label.startswith("Use mid-price"):
+                self._widgets["use_mid"] = element.id
+
+    def _check(self, status: str, elements: list[tuple[str, Any]], expected: str) -> str | None:
+        if status != expected:
+            return f"run ended with {status}"
+        metrics = 0
+        card = False
+        for element_type, element in elements:
+            if element_type == "exception":
+                return f"exception: {element.type}: {element.message}"
+            if element_type == "alert" and element.format == element.ERROR:
+                return f"error: {element.body}"
+            if element_type == "metric" and element.label == "Probabilidade":
+                metrics += 1
+            elif element_type == "markdown":
+                card = card or "event-card" in element.body
+                if element.body.startswith(FETCH_CAPTION):
+                    self.fetch_metrics = ast.literal_eval(element.body.removeprefix(FETCH_CAPTION))
+        if metrics < 2:
+            return "missing probability metrics"
+        if not card:
+            return "missing event card"
+        return None
+
+
+async def _drive(session: _Session, interval: float, start_at: float, deadline: float, report: dict) -> None:
+    # Spread sessions across the interval like independent viewers.
+    next_run = start_at + random.Random(session.index).uniform(0, interval)
+    while next_run < deadline:
+        delay = next_run - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            report["late"] += 1
+        started = time.perf_counter()
+        failure = await session.refresh()
+        elapsed = time.perf_counter() - started
+        if failure:
+            report["failures"].append(failure)
+        else:
+            report["latencies"].append(elapsed)
+        next_run += interval
+
+
+async def _load(
+    *,
+    sessions: int,
+    duration: float,
+    interval: float | None,
+    url: str,
+    slug: str,
+    pid: int,
+    api_url: str,
+    timeout: float,
+) -> dict:
+    # Warm-up: imports, first render and the fragment registry are paid
+    # once here, before the memory baseline.
+    warmup = _Session(-1, url, slug, timeout)
+    await warmup.open()
+    for _ in range(2):
+        failure = await warmup.refresh()
+        if failure:
+            raise RuntimeError(f"warm-up refresh failed: {failure}")
+    await warmup.close()
+    await asyncio.sleep(1.0)
+    rss_baseline = _proc_rss_bytes(pid)
+
+    clients = [_Session(i, url, slug, timeout) for i in range(sessions)]
+    opened = await asyncio.gather(*(client.open() for client in clients), return_exceptions=True)
+    reports = [{"latencies": [], "failures": [], "late": 0, "failed": None} for _ in clients]
+    live = []
+    for client, report, outcome in zip(clients, reports, opened):
+        if isinstance(outcome, BaseException):
+            report["failed"] = f"open: {type(outcome).__name__}: {outcome}"
+        else:
+            live.append((client, report))
+
+    if interval is None:
+        interval = warmup.auto_interval or 3.0
+    fetch_before = warmup.fetch_metrics or {}
+    start_at = time.time()
+    deadline = start_at + duration
+    cpu_before = _proc_cpu_seconds(pid)
+    api_before = _api_stats(api_url)
+    outcomes = await asyncio.gather(
+        *(_drive(client, interval, start_at, deadline, report) for client, report in live),
+        return_exceptions=True,
+    )
+    wall = max(time.time(), deadline) - start_at
+    cpu = _proc_cpu_seconds(pid) - cpu_before
+    api_after = _api_stats(api_url)
+    rss_end = _proc_rss_bytes(pid)
+    for (client, report), outcome in zip(live, outcomes):
+        if isinstance(outcome, BaseException):
+            report["failed"] = f"run: {type(outcome).__name__}: {outcome}"
+    await asyncio.gather(*(client.close() for client, _ in live), return_exceptions=True)
+
+    fetch_after = max(
+        (client.fetch_metrics for client, _ in live if client.fetch_metrics),
+        key=lambda metrics: metrics.get("calls", 0),
+        default={},
+    )
+    latencies = [value * 1000 for r in reports for value in r["latencies"]]
+    failures = [reason for r in reports for reason in r["failures"]]
+    failed_sessions = [r["failed"] for r in reports if r["failed"]]
+    connected = sum(1 for r in reports if not (r["failed"] or "").startswith("open"))
+    upstream = (api_after["events"] - api_before["events"]) + (api_after["book"] - api_before["book"])
+    return {
+        "sessions": sessions,
+        "failed_sessions": len(failed_sessions),
+        "duration_s": round(wall, 2),
+        "interval_s": interval,
+        "refreshes": len(latencies) + len(failures),
+        "failed_refreshes": len(failures),
+        "failure_reasons": sorted(set(failures + failed_sessions))[:5],
+        "late_refreshes": sum(r["late"] for r in reports),
+        "sessions_without_refresh": sum(1 for r in reports if not r["latencies"]),
+        "server_cpu_percent": round(100 * cpu / wall, 1) if wall else 0.0,
+        "server_rss_mb": round(rss_end / 2**20, 1),
+        "mem_per_session_mb": round((rss_end - rss_baseline) / connected / 2**20, 3) if connected else 0.0,
+        "upstream_requests": upstream,
+        "upstream_rps": round(upstream / wall, 2) if wall else 0.0,
+        "coalesced": fetch_after.get("coalesced", 0) - fetch_before.get("coalesced", 0),
+        "fresh_hits": fetch_after.get("fresh_hits", 0) - fetch_before.get("fresh_hits", 0),
+        "refresh_ms": {
+            "p50": round(statistics.median(latencies), 1) if latencies else 0.0,
+            "p95": round(_percentile(latencies, 0.95), 1),
+            "p99": round(_percentile(latencies, 0.99), 1),
+            "max": round(max(latencies), 1) if latencies else 0.0,
+        },
+    }
+
+
+def run_load_test(
+    *,
+    sessions: int,
+    duration: float,
+    interval: float | None,
+    api_url: str,
+    port: int = 8766,
+    timeout: float = 30.0,
+) -> dict:
+    from tracker.clock import period_bounds
+
+    start, _ = period_bounds(300)
+    slug = f"btc-updown-5m-{int(start)}"
+
+    with tempfile.TemporaryFile() as log:
+        server = _start_dashboard(port, api_url, log, timeout)
+        try:
+            return asyncio.run(
+                _load(
+                    sessions=sessions,
+                    duration=duration,
+                    interval=interval,
+                    url=f"ws://127.0.0.1:{port}/_stcore/stream",
+                    slug=slug,
+                    pid=server.pid,
+                    api_url=api_url,
+                    timeout=timeout,
+                )
+            )
+        except BaseException:
+            log.seek(0)
+            sys.stderr.write(log.read().decode(errors="replace")[-4000:])
+            raise
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard viewers against one Streamlit server.")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of steady-state load")
+    parser.add_argument("--interval", type=float, help="refresh period per session (default: the fragment's run_every)")
+    parser.add_argument("--port", type=int, default=8766, help="port for the Streamlit server")
+    parser.add_argument("--api-url", help="use an already running mock API instead of spawning one")
+    parser.add_argument("--api-port", type=int, default=8765)
+    parser.add_argument("--api-latency-ms", type=float, default=20.0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--max-p95-ms", type=float)
+    parser.add_argument("--max-upstream-rps", type=float)
+    parser.add_argument("--max-mem-per-session-mb", type=float)
+    args = parser.parse_args()
+
+    proc = None
+    api_url = args.api_url
+    if api_url is None:
+        proc, api_url = _start_mock_api(args.api_port, args.api_latency_ms)
+
+    try:
+        report = run_load_test(
+            sessions=args.sessions,
+            duration=args.duration,
+            interval=args.interval,
+            api_url=api_url,
+            port=args.port,
+        )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=5)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for key, value in report.items():
+            print(f"{key:>24}: {value}")
+
+    failures = []
+    if args.max_p95_ms is not None and report["refresh_ms"]["p95"] > args.max_p95_ms:
+        failures.append(f"p95 refresh {report['refresh_ms']['p95']}ms > {args.max_p95_ms}ms")
+    if args.max_upstream_rps is not None and report["upstream_rps"] > args.max_upstream_rps:
+        failures.append(f"upstream {report['upstream_rps']} req/s > {args.max_upstream_rps} req/s")
+    if args.max_mem_per_session_mb is not None and report["mem_per_session_mb"] > args.max_mem_per_session_mb:
+        failures.append(f"memory {report['mem_per_session_mb']}MB/session > {args.max_mem_per_session_mb}MB")
+    if report["failed_sessions"]:
+        failures.append(f"{report['failed_sessions']} sessions failed")
+    if report["failed_refreshes"]:
+        failures.append(f"{report['failed_refreshes']} refreshes failed: {report['failure_reasons']}")
+    if report["sessions_without_refresh"]:
+        failures.append(f"{report['sessions_without_refresh']} sessions never completed a refresh")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
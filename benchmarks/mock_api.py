@@ -0,0 +1,130 @@
+"""Local stand-in for the Gamma events and CLOB book endpoints.
+
+Serves `/events?slug=...` and `/book?token_id=...` for any slug, with a
+slowly random-walking (or, with `--static`, frozen) book, and counts requests at `/__stats`.
+Run with `python benchmarks/mock_api.py [--port 8765] [--latency-ms 20]`.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class MockPolymarketAPI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        *,
+        latency_seconds: float = 0.0,
+        static: bool = False,
+        seed: int = 7,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.latency_seconds = latency_seconds
+        self.static = static
+        self.lock = threading.Lock()
+        self.counts = {"events": 0, "book": 0}
+        self.started = time.monotonic()
+        self._rng = random.Random(seed)
+        self._mid = 0.5
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def event(self, slug: str) -> list[dict]:
+        return [
+            {
+                "title": f"Mock {slug}",
+                "markets": [
+                    {
+                        "question": "Up or Down?",
+                        "clobTokenIds": json.dumps([f"{slug}-up", f"{slug}-down"]),
+                        "outcomes": json.dumps(["Up", "Down"]),
+                    }
+                ],
+            }
+        ]
+
+    def book(self, token_id: str) -> dict:
+        with self.lock:
+            if not self.static:
+                self._mid = min(0.95, max(0.05, self._mid + self._rng.choice((-0.01, 0.0, 0.0, 0.01))))
+            mid = self._mid
+        if token_id.endswith("-down"):
+            mid = 1.0 - mid
+        return {
+            "bids": [{"price": f"{mid - 0.01 * (k + 1):.2f}", "size": "100"} for k in range(5)],
+            "asks": [{"price": f"{mid + 0.01 * (k + 1):.2f}", "size": "100"} for k in range(5)],
+            "last_trade_price": f"{mid:.2f}",
+        }
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {**self.counts, "uptime": time.monotonic() - self.started}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockPolymarketAPI
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path == "/__stats":
+            self._send(self.server.stats())
+            return
+        if url.path not in ("/events", "/book"):
+            self.send_error(404)
+            return
+
+        with self.server.lock:
+            self.server.counts[url.path.lstrip("/")] += 1
+        if self.server.latency_seconds:
+            time.sleep(self.server.latency_seconds)
+
+        if url.path == "/events":
+            self._send(self.server.event(query.get("slug", "")))
+        else:
+            self._send(self.server.book(query.get("token_id", "")))
+
+    def _send(self, payload: object) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--static", action="store_true", help="never move the book (quiet market)")
+    args = parser.parse_args()
+
+    server = MockPolymarketAPI((args.host, args.port), latency_seconds=args.latency_ms / 1000, static=args.static)
+    print(f"mock API on {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
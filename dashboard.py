@@ -4,7 +4,9 @@ from datetime import datetime, timezone
 
 import streamlit as st
 
-from tracker import PolymarketAPIError, collect_event_probabilities
+from tracker import PolymarketAPIError, collect_event_probabilities, get_fetch_metrics
+from tracker.changes import event_fingerprint
+from tracker.clock import seconds_until, server_clock
 
 
 st.set_page_config(page_title="Polymarket Real-Time Probability Tracker", layout="centered")
@@ -84,7 +86,7 @@ def generate_next_slug(current_slug: str, interval_seconds: int = 300) -> str:
     return next_slug
 
 
-def get_time_until_next_period(current_timestamp: int, interval_seconds: int = 300) -> int:
+def get_time_until_next_period(current_timestamp: int, interval_seconds: int = 300) -> float:
     """
     Calcula quantos segundos faltam até o próximo período
     
@@ -93,18 +95,22 @@ def get_time_until_next_period(current_timestamp: int, interval_seconds: int = 3
         interval_seconds: Duração do período em segundos
     
     Returns:
-        Segundos até o próximo período
+        Segundos (fracionários) até o próximo período, pelo relógio estimado do servidor
     """
     # Timestamp do fim do período atual
     period_end = current_timestamp + interval_seconds
     
-    # Timestamp atual
-    now = int(datetime.now(timezone.utc).timestamp())
-    
-    # Diferença
-    remaining = period_end - now
-    
-    return max(0, remaining)  # Nunca retorna negativo
+    # Nunca retorna negativo
+    return seconds_until(period_end)
+
+
+def format_server_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+
+
+def format_countdown(time_remaining: float) -> str:
+    minutes, seconds = divmod(int(time_remaining), 60)
+    return f"{minutes}min {seconds}s"
 
 
 def should_update_slug(current_slug: str) -> bool:
@@ -128,6 +134,9 @@ def should_update_slug(current_slug: str) -> bool:
 if "history" not in st.session_state:
     st.session_state.history = {}
 
+if "last_change" not in st.session_state:
+    st.session_state.last_change = None
+
 if "auto_mode_enabled" not in st.session_state:
     st.session_state.auto_mode_enabled = False
 
@@ -186,10 +195,8 @@ with st.sidebar:
         
         if timestamp:
             time_remaining = get_time_until_next_period(timestamp)
-            minutes = time_remaining // 60
-            seconds = time_remaining % 60
             
-            st.metric("Tempo restante", f"{minutes}min {seconds}s")
+            st.metric("Tempo restante", format_countdown(time_remaining))
             
             next_slug = generate_next_slug(current_slug)
             st.caption(f"**Próximo:** `{next_slug}`")
@@ -224,16 +231,21 @@ def render_live_probabilities() -> None:
 
     p0 = probs[0] if probs[0] is not None else 0.0
     p1 = probs[1] if probs[1] is not None else 0.0
-    
+
+    # Marca quando o topo do livro realmente mudou (só o slug atual é guardado)
+    fingerprint = (slug, event_fingerprint(data))
+    last_change = st.session_state.last_change
+    if last_change is None or last_change["fingerprint"] != fingerprint:
+        last_change = {"fingerprint": fingerprint, "at": format_server_time(server_clock.now())}
+        st.session_state.last_change = last_change
+
     # Calcula countdown
     timestamp = extract_timestamp_from_slug(slug)
     if timestamp:
         time_remaining = get_time_until_next_period(timestamp)
-        minutes = time_remaining // 60
-        seconds = time_remaining % 60
         countdown_html = f"""
         <div class="countdown">
-            ⏱️ Janela fecha em: {minutes}min {seconds}s
+            ⏱️ Janela fecha em: {format_countdown(time_remaining)}
         </div>
         """
     else:
@@ -247,7 +259,7 @@ def render_live_probabilities() -> None:
           <div class="muted">{data['market_question']}</div>
           <div class="muted">Slug atual: <code>{slug}</code></div>
           {countdown_html}
-          <div class="muted">Atualizado em {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}</div>
+          <div class="muted">Atualizado em {format_server_time(server_clock.now())} · última mudança no livro: {last_change['at']}</div>
         </div>
         """,
         unsafe_allow_html=True,
@@ -290,9 +302,11 @@ def render_live_probabilities() -> None:
                 "snapshots": [snapshot.__dict__ for snapshot in data["snapshots"]],
             }
         )
+        st.caption(f"fetch: {get_fetch_metrics()}")
+        st.caption(f"Relógio do servidor: {server_clock.stats()}")
 
-    # Salva histórico
-    st.session_state.history[slug] = (p0, p1)
+    # Salva histórico (só do slug atual, para não crescer a cada janela)
+    st.session_state.history = {slug: (p0, p1)}
 
 
 # ========== AUTO-REFRESH ==========
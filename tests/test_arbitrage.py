@@ -0,0 +1,158 @@
+import statistics
+import time
+
+from tracker.arbitrage import BUY_BOTH, SELL_BOTH, ComplementArbitrageScanner
+
+
+def _book(bids, asks):
+    return {
+        "bids": [{"price": str(p), "size": str(s)} for p, s in bids],
+        "asks": [{"price": str(p), "size": str(s)} for p, s in asks],
+    }
+
+
+def test_no_opportunity_on_fair_pair():
+    scanner = ComplementArbitrageScanner()
+    scanner.track_pair("m", "a", "b")
+    scanner.on_book_update("a", _book([(0.48, 10)], [(0.50, 10)]))
+    found = scanner.on_book_update("b", _book([(0.49, 10)], [(0.51, 10)]))
+    assert found == []
+    assert scanner.opportunities.empty()
+
+
+def test_buy_both_walks_levels_with_size():
+    scanner = ComplementArbitrageScanner()
+    scanner.track_pair("m", "a", "b")
+    scanner.on_book_update("a", _book([], [(0.47, 5), (0.45, 10), (0.55, 100)]))
+    found = scanner.on_book_update("b", _book([], [(0.50, 12), (0.52, 50)]))
+
+    assert len(found) == 1
+    opp = found[0]
+    assert opp.side == BUY_BOTH
+    assert opp.best_prices == (0.45, 0.50)
+    assert round(opp.edge, 8) == 0.05
+    # 10 @ (0.45+0.50), 2 @ (0.47+0.50), 3 @ (0.47+0.52); 0.55 no longer crosses
+    assert opp.levels == [(0.45, 0.50, 10.0), (0.47, 0.50, 2.0), (0.47, 0.52, 3.0)]
+    assert opp.size == 15.0
+    assert round(opp.expected_profit, 8) == round(10 * 0.05 + 2 * 0.03 + 3 * 0.01, 8)
+    assert scanner.opportunities.get_nowait() is opp
+
+
+def test_sell_both_and_latency_stamps():
+    ticks = iter([100, 250, 400])
+    scanner = ComplementArbitrageScanner(clock_ns=lambda: next(ticks))
+    scanner.track_pair("m", "a", "b")
+    scanner.on_book_update("a", _book([(0.55, 4)], []), received_ns=0)
+    (opp,) = scanner.on_book_update("b", _book([(0.50, 7)], []), received_ns=50)
+    assert opp.side == SELL_BOTH
+    assert opp.size == 4.0
+    assert opp.received_ns == 50
+    assert opp.detection_latency_ms == (100 - 50) / 1_000_000
+
+
+def test_detection_latency_stays_low():
+    scanner = ComplementArbitrageScanner()
+    for i in range(50):
+        scanner.track_pair(f"m{i}", f"a{i}", f"b{i}")
+        scanner.on_book_update(f"b{i}", _book([(0.40, 10)], [(0.49, 10)]))
+
+    # Alternate the best ask so every update is a genuinely new opportunity.
+    books = [
+        _book(
+            [(0.40 - 0.01 * k, 100) for k in range(20)],
+            [(best_ask + 0.01 * k, 100) for k in range(20)],
+        )
+        for best_ask in (0.50, 0.49)
+    ]
+    latencies = []
+    for n in range(2000):
+        start = time.perf_counter_ns()
+        scanner.on_book_update(f"a{n % 50}", books[(n // 50) % 2], received_ns=start)
+        latencies.append((time.perf_counter_ns() - start) / 1_000_000)
+
+    assert scanner.opportunities.qsize() == 2000
+    assert statistics.median(latencies) < 2.0
+
+
+def test_unchanged_opportunity_is_emitted_once():
+    scanner = ComplementArbitrageScanner()
+    scanner.track_pair("m", "a", "b")
+    crossed_a = _book([], [(0.45, 10)])
+    crossed_b = _book([], [(0.50, 10)])
+    assert len(scanner.on_pair_update("m", crossed_a, crossed_b)) == 1
+    assert scanner.on_pair_update("m", crossed_a, crossed_b) == []
+    assert len(scanner.on_pair_update("m", crossed_a, _book([], [(0.50, 8)]))) == 1
+    scanner.on_pair_update("m", _book([], [(0.55, 10)]), crossed_b)
+    assert len(scanner.on_pair_update("m", crossed_a, crossed_b)) == 1
+    assert scanner.opportunities.qsize() == 3
+
+
+def test_pair_update_does_not_mix_polls():
+    scanner = ComplementArbitrageScanner()
+    scanner.track_pair("m", "a", "b")
+    assert scanner.on_pair_update("m", _book([], [(0.60, 10)]), _book([], [(0.42, 10)])) == []
+    assert scanner.on_pair_update("m", _book([], [(0.40, 10)]), _book([], [(0.62, 10)])) == []
+    assert scanner.opportunities.empty()
+
+
+def test_max_book_age_skips_stale_other_side():
+    scanner = ComplementArbitrageScanner(max_book_age_ns=1_000)
+    scanner.track_pair("m", "a", "b")
+    scanner.on_book_update("b", _book([], [(0.42, 10)]), received_ns=0)
+    assert scanner.on_book_update("a", _book([], [(0.40, 10)]), received_ns=5_000) == []
+    assert len(scanner.on_book_update("b", _book([], [(0.42, 10)]), received_ns=5_500)) == 1
+
+
+def test_untrack_and_rollover_drop_state():
+    scanner = ComplementArbitrageScanner()
+    scanner.track_pair("m", "a", "b")
+    scanner.on_pair_update("m", _book([], [(0.45, 10)]), _book([], [(0.50, 10)]))
+    scanner.track_pair("m", "c", "d")
+    assert scanner.on_book_update("a", _book([], [(0.45, 10)])) == []
+    scanner.untrack_pair("m")
+    assert scanner.tracked_markets == []
+    assert (scanner._bids, scanner._asks, scanner._token_market, scanner._last_emitted) == ({}, {}, {}, {})
+
+
+def test_fair_pairs_summing_to_one_emit_nothing():
+    scanner = ComplementArbitrageScanner()
+    for cents in range(1, 100):
+        a, b = cents / 100, (100 - cents) / 100
+        market = f"m{cents}"
+        scanner.track_pair(market, f"a{cents}", f"b{cents}")
+        found = scanner.on_pair_update(market, _book([(a, 10)], [(a, 10)]), _book([(b, 10)], [(b, 10)]))
+        assert found == [], (a, b)
+    assert scanner.opportunities.empty()
+
+
+def test_pair_update_stamps_older_book_and_ignores_untracked():
+    scanner = ComplementArbitrageScanner(clock_ns=lambda: 1_000)
+    assert scanner.on_pair_update("unknown", _book([], []), _book([], [])) == []
+    scanner.track_pair("m", "a", "b")
+    (opp,) = scanner.on_pair_update(
+        "m", _book([], [(0.45, 10)]), _book([], [(0.50, 10)]), received_ns=700, received_ns_b=400
+    )
+    assert opp.received_ns == 400
+    assert opp.detection_latency_ms == 600 / 1_000_000
+
+
+def test_service_stamps_receive_time_at_fetch(monkeypatch):
+    from tracker import service
+    from tracker.singleflight import SingleFlight
+
+    books = {"a": _book([], [(0.45, 10)]), "b": _book([], [(0.50, 10)])}
+    event = [{"title": "t", "markets": [{"clobTokenIds": '["a", "b"]', "outcomes": '["Up", "Down"]'}]}]
+
+    def fetch(url, *, params=None):
+        return books[params["token_id"]] if "token_id" in params else event
+
+    monkeypatch.setattr(service, "request_json_with_retries", fetch)
+    monkeypatch.setattr(service, "_single_flight", SingleFlight(freshness_seconds=60))
+
+    _, stamped = service.fetch_order_book_stamped("a")
+    scanner = ComplementArbitrageScanner()
+    before_collect = time.perf_counter_ns()
+    service.collect_event_probabilities("slug", scanner=scanner)
+    (opp,) = list(scanner.opportunities.queue)
+    # "a" came from the freshness cache, so the book is as old as its first fetch.
+    assert opp.received_ns == stamped < before_collect
@@ -0,0 +1,82 @@
+import io
+import json
+
+from tracker.changes import ChangeDetector, DeltaRecorder, event_fingerprint, replay
+from tracker.models import OrderBookSnapshot
+
+
+def _snap(token, bid, ask, last=0.5):
+    return OrderBookSnapshot(token, last, bid, ask, (bid + ask) / 2, ask - bid)
+
+
+def _event(snapshots):
+    return {"event_title": "t", "market_question": "q", "labels": ["Up", "Down"], "snapshots": snapshots}
+
+
+def test_snapshot_fingerprint_and_hash():
+    a = _snap("x", 0.40, 0.42)
+    b = _snap("x", 0.40, 0.42)
+    assert a == b and hash(a) == hash(b)
+    assert a.fingerprint == ("x", 0.5, 0.40, 0.42)
+    assert a.fingerprint != _snap("x", 0.41, 0.42).fingerprint
+
+
+def test_change_detector_suppresses_repeats():
+    detector = ChangeDetector()
+    quiet = event_fingerprint(_event([_snap("a", 0.4, 0.42), _snap("b", 0.58, 0.6)]))
+    moved = event_fingerprint(_event([_snap("a", 0.41, 0.42), _snap("b", 0.58, 0.6)]))
+    assert [detector.changed("s", f) for f in (quiet, quiet, quiet, moved, moved)] == [True, False, False, True, False]
+    assert (detector.published, detector.suppressed) == (2, 3)
+    detector.forget("s")
+    assert detector.changed("s", moved)
+
+
+def test_delta_recorder_round_trips_with_keyframes():
+    stream = io.StringIO()
+    recorder = DeltaRecorder(stream, keyframe_interval=3)
+    states = [
+        [_snap("a", 0.40, 0.42), _snap("b", 0.58, 0.60)],
+        [_snap("a", 0.40, 0.42), _snap("b", 0.58, 0.60)],
+        [_snap("a", 0.41, 0.42), _snap("b", 0.58, 0.60)],
+        [_snap("a", 0.41, 0.43), _snap("b", 0.57, 0.60)],
+        [_snap("a", 0.42, 0.43), _snap("b", 0.57, 0.60)],
+    ]
+    written = [recorder.record("s", snaps, timestamp=float(i)) for i, snaps in enumerate(states)]
+
+    assert written == [True, False, True, True, True]
+    assert (recorder.keyframes, recorder.deltas, recorder.skipped) == (2, 2, 1)
+    replayed = list(replay(stream.getvalue().splitlines()))
+    assert [ts for ts, _, _ in replayed] == [0.0, 2.0, 3.0, 4.0]
+    assert [snaps for _, _, snaps in replayed] == [states[0], states[2], states[3], states[4]]
+
+
+def test_keyframe_every_interval_records():
+    quiet = [_snap("a", 0.40, 0.42), _snap("b", 0.58, 0.60)]
+    moved = [_snap("a", 0.41, 0.42), _snap("b", 0.58, 0.60)]
+    stream = io.StringIO()
+    recorder = DeltaRecorder(stream, keyframe_interval=20)
+    for i in range(60):
+        recorder.record("s", moved if i % 2 else quiet, timestamp=float(i))
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) == 60
+    assert [i for i, line in enumerate(lines) if "kf" in line] == [0, 20, 40]
+    assert (recorder.keyframes, recorder.deltas, recorder.skipped) == (3, 57, 0)
+
+
+def test_quiet_window_writes_only_changes():
+    quiet = [_snap("a", 0.40, 0.42), _snap("b", 0.58, 0.60)]
+    moved = [_snap("a", 0.41, 0.42), _snap("b", 0.58, 0.60)]
+    stream = io.StringIO()
+    recorder = DeltaRecorder(stream, keyframe_interval=20)
+    for i in range(100):
+        recorder.record("s", moved if i % 25 == 24 else quiet, timestamp=float(i))
+
+    # One keyframe, then a delta each time the book moves (24, 49, 74, 99) and returns (25, 50, 75).
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["t"] for line in lines] == [0.0, 24.0, 25.0, 49.0, 50.0, 74.0, 75.0, 99.0]
+    assert ["kf" in line for line in lines] == [True] + [False] * 7
+    assert (recorder.keyframes, recorder.deltas, recorder.skipped) == (1, 7, 92)
+    # Deltas carry only the token and fields that moved.
+    assert lines[1]["d"].keys() == {"a"}
+    assert lines[1]["d"]["a"].keys() == {"best_bid", "mid_price_probability", "spread"}
@@ -0,0 +1,128 @@
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tracker.clock import ServerClock, period_bounds
+from tracker.http_client import request_json_with_retries
+from tracker.slug_manager import SlugManager
+
+SERVER_OFFSET = 42.0
+
+
+class _FakeTime:
+    def __init__(self, wall=1_000_000.0):
+        self.wall0 = wall
+        self.mono = 0.0
+
+    def wall(self):
+        return self.wall0 + self.mono
+
+    def monotonic(self):
+        return self.mono
+
+
+@pytest.fixture
+def mock_server():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = b"{}"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def date_time_string(self, timestamp=None):
+            return formatdate(time.time() + SERVER_OFFSET, usegmt=True)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/book"
+    server.shutdown()
+    server.server_close()
+
+
+def test_offset_from_mock_server_date_header(mock_server):
+    clock = ServerClock()
+    for _ in range(3):
+        assert request_json_with_retries(mock_server, max_retries=0, clock=clock) == {}
+
+    assert clock.samples == 3
+    assert clock.rtt is not None and clock.rtt < 1.0
+    assert abs(clock.offset - SERVER_OFFSET) <= 1.0
+    assert abs(clock.now() - (time.time() + SERVER_OFFSET)) <= 1.0
+
+
+def test_bounds_converge_below_one_second():
+    fake = _FakeTime()
+    clock = ServerClock(wall=fake.wall, monotonic=fake.monotonic)
+    true_offset = 3.3
+    for step in range(20):
+        fake.mono = step * 7.13
+        sent = fake.monotonic()
+        fake.mono += 0.02
+        received = fake.monotonic()
+        server_time = int(fake.wall() - 0.01 + true_offset)
+        clock.observe(sent, received, server_time)
+
+    assert abs(clock.offset - true_offset) < 0.05
+    assert clock.uncertainty < 0.05
+    assert clock.resets == 0
+
+
+def test_wall_clock_steps_do_not_move_local_time_and_server_steps_reset():
+    fake = _FakeTime()
+    clock = ServerClock(wall=fake.wall, monotonic=fake.monotonic)
+    fake.wall0 += 3600  # host clock jumps; monotonic time does not
+    assert clock.local_time() == 1_000_000.0
+
+    clock.observe(0.0, 0.01, 1_000_010.0)
+    assert 9.0 <= clock.offset <= 11.0
+    for step in range(1, 4):
+        fake.mono = step * 5.0
+        clock.observe(fake.mono, fake.mono + 0.01, 1_000_100.0 + fake.mono)
+    assert (clock.outliers, clock.resets) == (3, 1)
+    assert 99.0 <= clock.offset <= 101.0
+
+
+def _converge(clock, fake, true_offset, steps, start=0):
+    for step in range(start, start + steps):
+        fake.mono = step * 7.13
+        sent = fake.monotonic()
+        fake.mono += 0.02
+        clock.observe(sent, fake.monotonic(), int(fake.wall() - 0.01 + true_offset))
+
+
+def test_single_stale_date_header_is_ignored():
+    fake = _FakeTime()
+    clock = ServerClock(wall=fake.wall, monotonic=fake.monotonic)
+    true_offset = 3.3
+    _converge(clock, fake, true_offset, 20)
+    offset, uncertainty = clock.offset, clock.uncertainty
+
+    # A cached response carrying a Date two seconds old.
+    fake.mono = 20 * 7.13
+    clock.observe(fake.mono, fake.mono + 0.02, int(fake.wall() + true_offset) - 2.0)
+    assert (clock.outliers, clock.resets) == (1, 0)
+    assert (clock.offset, clock.uncertainty) == (offset, uncertainty)
+
+    _converge(clock, fake, true_offset, 5, start=21)
+    assert (clock.outliers, clock.resets) == (1, 0)
+    assert abs(clock.offset - true_offset) < 0.05
+
+
+def test_slug_manager_uses_server_clock_with_subsecond_precision():
+    fake = _FakeTime(wall=1_770_999_900.0)
+    clock = ServerClock(wall=fake.wall, monotonic=fake.monotonic)
+    clock.observe(0.0, 0.0, 1_770_999_900.0 + 299.0, resolution=0.5)
+
+    assert period_bounds(300, now=clock.now()) == (1_770_999_900.0, 1_771_000_200.0)
+    remaining = SlugManager(clock=clock).get_time_until_next_period()
+    assert remaining == pytest.approx(0.75)
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tracker import service
+from tracker.singleflight import SingleFlight
+
+
+def _slow_counter(delay=0.1):
+    calls = []
+
+    def fetch(url, *, params=None):
+        calls.append((url, params))
+        time.sleep(delay)
+        return {"url": url, "params": params}
+
+    return calls, fetch
+
+
+def test_concurrent_threads_share_one_request(monkeypatch):
+    calls, fetch = _slow_counter()
+    monkeypatch.setattr(service, "request_json_with_retries", fetch)
+    monkeypatch.setattr(service, "_single_flight", SingleFlight())
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(service.fetch_json("u", {"token_id": "1"})))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+    stats = service.get_fetch_metrics()
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 7
+
+
+def test_async_callers_coalesce(monkeypatch):
+    calls, fetch = _slow_counter()
+    monkeypatch.setattr(service, "request_json_with_retries", fetch)
+    monkeypatch.setattr(service, "_single_flight", SingleFlight())
+
+    async def run():
+        return await asyncio.gather(
+            *(service.fetch_json_async("u", {"token_id": "1"}) for _ in range(5)),
+            service.fetch_json_async("u", {"token_id": "2"}),
+        )
+
+    results = asyncio.run(run())
+    assert len(calls) == 2
+    assert results[0] is results[4]
+    assert results[5]["params"] == {"token_id": "2"}
+
+
+def test_freshness_window_and_errors_not_cached():
+    now = [0.0]
+    flight = SingleFlight(freshness_seconds=0.25, clock=lambda: now[0])
+    assert flight.do("k", lambda: 1) == 1
+    now[0] = 0.2
+    assert flight.do("k", lambda: 2) == 1
+    now[0] = 0.3
+    assert flight.do("k", lambda: 3) == 3
+    assert flight.stats()["fresh_hits"] == 1
+
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("err", boom)
+    assert flight.do("err", lambda: "ok") == "ok"
+
+
+def test_async_followers_do_not_hold_executor_threads():
+    flight = SingleFlight()
+    unblocked = threading.Event()
+
+    def leader_fetch():
+        assert unblocked.wait(timeout=2), "executor starved by waiting followers"
+        return "v"
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=2))
+        callers = [asyncio.create_task(flight.do_async("k", leader_fetch)) for _ in range(20)]
+        await asyncio.sleep(0.05)
+        await loop.run_in_executor(None, unblocked.set)
+        return await asyncio.gather(*callers)
+
+    assert asyncio.run(run()) == ["v"] * 20
+    assert flight.stats()["executions"] == 1
+
+
+def test_async_follower_joins_threaded_leader():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(timeout=2)
+        return {"shared": True}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+    leader.start()
+    started.wait(timeout=2)
+
+    async def follow():
+        task = asyncio.create_task(flight.do_async("k", fetch))
+        await asyncio.sleep(0.01)
+        release.set()
+        return await task
+
+    follower_result = asyncio.run(follow())
+    leader.join()
+    assert follower_result is results[0]
+    assert flight.stats()["coalesced"] == 1
@@ -1,9 +1,19 @@
+from tracker.arbitrage import ComplementArbitrageScanner
 from tracker.errors import PolymarketAPIError
-from tracker.service import calculate_probability, collect_event_probabilities, get_market_data
+from tracker.service import (
+    calculate_probability,
+    collect_event_probabilities,
+    collect_event_probabilities_async,
+    get_fetch_metrics,
+    get_market_data,
+)
 
 __all__ = [
     "PolymarketAPIError",
+    "ComplementArbitrageScanner",
     "get_market_data",
     "calculate_probability",
     "collect_event_probabilities",
+    "collect_event_probabilities_async",
+    "get_fetch_metrics",
 ]
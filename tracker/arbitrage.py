@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from tracker.models import ArbitrageOpportunity
+from tracker.probability import extract_levels
+
+BUY_BOTH = "buy_both"
+SELL_BOTH = "sell_both"
+
+Level = tuple[float, float]
+
+# Prices are decimal ticks held in binary floats: 0.41 + 0.59 leaves ~1e-16
+# of residue, which must not read as an edge.
+EDGE_EPSILON = 1e-9
+
+
+def walk_complement_levels(
+    side_a: list[Level],
+    side_b: list[Level],
+    *,
+    side: str,
+    min_edge: float = 0.0,
+) -> list[tuple[float, float, float]]:
+    """Consume both books level by level while the pair still crosses 1.
+
+    `side_a`/`side_b` must be sorted best-first (asks ascending for BUY_BOTH,
+    bids descending for SELL_BOTH). Returns `(price_a, price_b, size)` fills.
+    """
+    fills: list[tuple[float, float, float]] = []
+    i = j = 0
+    remaining_a = side_a[0][1] if side_a else 0.0
+    remaining_b = side_b[0][1] if side_b else 0.0
+
+    while i < len(side_a) and j < len(side_b):
+        price_a = side_a[i][0]
+        price_b = side_b[j][0]
+        edge = 1.0 - price_a - price_b if side == BUY_BOTH else price_a + price_b - 1.0
+        if edge <= min_edge + EDGE_EPSILON:
+            break
+
+        size = min(remaining_a, remaining_b)
+        fills.append((price_a, price_b, size))
+        remaining_a -= size
+        remaining_b -= size
+        if remaining_a <= 0:
+            i += 1
+            remaining_a = side_a[i][1] if i < len(side_a) else 0.0
+        if remaining_b <= 0:
+            j += 1
+            remaining_b = side_b[j][1] if j < len(side_b) else 0.0
+
+    return fills
+
+
+class ComplementArbitrageScanner:
+    """Detects `ask_a + ask_b < 1` / `bid_a + bid_b > 1` on tracked binary pairs.
+
+    `on_book_update` stores one token's book and re-evaluates its pair;
+    `on_pair_update` stores both books of a pair taken from the same poll and
+    evaluates once, so a fresh side is never matched against a stale one.
+    With `max_book_age_ns`, single-side updates are only evaluated when the
+    other side was received within that window.
+
+    An opportunity is pushed to `opportunities`, stamped with receive/detect
+    times from a monotonic nanosecond clock, only when its side, best prices
+    or size differ from the last one emitted for that market. Its
+    `received_ns` is the triggering update's stamp, or for `on_pair_update`
+    the older of the two books, so latency includes book age. Callers
+    passing their own stamps must use the same clock as `clock_ns`
+    (`time.perf_counter_ns`, as the service layer does, by default).
+
+    Safe to share between threads: updates and tracking changes are
+    serialized by an internal lock.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_edge: float = 0.0,
+        max_book_age_ns: int | None = None,
+        opportunities: queue.Queue[ArbitrageOpportunity] | None = None,
+        clock_ns: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        self.min_edge = min_edge
+        self.max_book_age_ns = max_book_age_ns
+        self.opportunities: queue.Queue[ArbitrageOpportunity] = opportunities if opportunities is not None else queue.Queue()
+        self._clock_ns = clock_ns
+        self._lock = threading.RLock()
+        self._pairs: dict[str, tuple[str, str]] = {}
+        self._token_market: dict[str, str] = {}
+        self._bids: dict[str, list[Level]] = {}
+        self._asks: dict[str, list[Level]] = {}
+        self._received: dict[str, int] = {}
+        self._last_emitted: dict[tuple[str, str], tuple[tuple[float, float], float]] = {}
+
+    def now_ns(self) -> int:
+        return self._clock_ns()
+
+    def track_pair(self, market_id: str, token_a: str, token_b: str) -> None:
+        with self._lock:
+            if self._pairs.get(market_id) == (token_a, token_b):
+                return
+            self.untrack_pair(market_id)
+            self._pairs[market_id] = (token_a, token_b)
+            self._token_market[token_a] = market_id
+            self._token_market[token_b] = market_id
+
+    def untrack_pair(self, market_id: str) -> None:
+        with self._lock:
+            tokens = self._pairs.pop(market_id, ())
+            for token_id in tokens:
+                self._token_market.pop(token_id, None)
+                self._bids.pop(token_id, None)
+                self._asks.pop(token_id, None)
+                self._received.pop(token_id, None)
+            for side in (BUY_BOTH, SELL_BOTH):
+                self._last_emitted.pop((market_id, side), None)
+
+    @property
+    def tracked_markets(self) -> list[str]:
+        with self._lock:
+            return list(self._pairs)
+
+    def on_book_update(
+        self,
+        token_id: str,
+        payload: dict[str, Any],
+        *,
+        received_ns: int | None = None,
+    ) -> list[ArbitrageOpportunity]:
+        if received_ns is None:
+            received_ns = self._clock_ns()
+
+        with self._lock:
+            market_id = self._token_market.get(token_id)
+            if market_id is None:
+                return []
+
+            self._store_book(token_id, payload, received_ns)
+
+            if self.max_book_age_ns is not None:
+                token_a, token_b = self._pairs[market_id]
+                other = token_b if token_id == token_a else token_a
+                other_received = self._received.get(other)
+                if other_received is None or received_ns - other_received > self.max_book_age_ns:
+                    return []
+
+            return self._evaluate(market_id, received_ns)
+
+    def on_pair_update(
+        self,
+        market_id: str,
+        payload_a: dict[str, Any],
+        payload_b: dict[str, Any],
+        *,
+        received_ns: int | None = None,
+        received_ns_b: int | None = None,
+    ) -> list[ArbitrageOpportunity]:
+        """Store both books of a pair and evaluate once.
+
+        `received_ns` stamps `payload_a` (and `payload_b` unless
+        `received_ns_b` is given); both default to now.
+        """
+        if received_ns is None:
+            received_ns = self._clock_ns()
+        if received_ns_b is None:
+            received_ns_b = received_ns
+
+        with self._lock:
+            pair = self._pairs.get(market_id)
+            if pair is None:
+                return []
+
+            token_a, token_b = pair
+            self._store_book(token_a, payload_a, received_ns)
+            self._store_book(token_b, payload_b, received_ns_b)
+            return self._evaluate(market_id, min(received_ns, received_ns_b))
+
+    def _store_book(self, token_id: str, payload: dict[str, Any], received_ns: int) -> None:
+        self._bids[token_id] = sorted(extract_levels(payload.get("bids")), key=lambda level: level[0], reverse=True)
+        self._asks[token_id] = sorted(extract_levels(payload.get("asks")), key=lambda level: level[0])
+        self._received[token_id] = received_ns
+
+    def _evaluate(self, market_id: str, received_ns: int) -> list[ArbitrageOpportunity]:
+        token_a, token_b = self._pairs[market_id]
+        found: list[ArbitrageOpportunity] = []
+
+        for side, books in ((BUY_BOTH, self._asks), (SELL_BOTH, self._bids)):
+            side_a = books.get(token_a)
+            side_b = books.get(token_b)
+            fills = walk_complement_levels(side_a, side_b, side=side, min_edge=self.min_edge) if side_a and side_b else []
+            if not fills:
+                self._last_emitted.pop((market_id, side), None)
+                continue
+
+            best_a, best_b, _ = fills[0]
+            total_size = sum(size for _, _, size in fills)
+            signature = ((best_a, best_b), total_size)
+            if self._last_emitted.get((market_id, side)) == signature:
+                continue
+            self._last_emitted[(market_id, side)] = signature
+
+            sign = 1.0 if side == BUY_BOTH else -1.0
+            opportunity = ArbitrageOpportunity(
+                market_id=market_id,
+                side=side,
+                token_ids=(token_a, token_b),
+                best_prices=(best_a, best_b),
+                edge=sign * (1.0 - best_a - best_b),
+                size=total_size,
+                expected_profit=sum(sign * (1.0 - pa - pb) * size for pa, pb, size in fills),
+                levels=fills,
+                received_ns=received_ns,
+                detected_ns=self._clock_ns(),
+            )
+            self.opportunities.put(opportunity)
+            found.append(opportunity)
+
+        return found
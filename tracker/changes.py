@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Iterable, Iterator, TextIO
+
+from tracker.models import OrderBookSnapshot
+
+SNAPSHOT_FIELDS = ("last_trade_price", "best_bid", "best_ask", "mid_price_probability", "spread")
+
+
+def event_fingerprint(data: dict[str, Any]) -> tuple:
+    """Cheap identity of a `collect_event_probabilities` result."""
+    return (
+        data["event_title"],
+        data["market_question"],
+        tuple(data["labels"]),
+        tuple(snapshot.fingerprint for snapshot in data["snapshots"]),
+    )
+
+
+class ChangeDetector:
+    """Remembers the last fingerprint per key and reports whether a new one differs.
+
+    Keys are kept until `forget` is called; callers whose keys roll over
+    (one slug per window) should forget the old key.
+    """
+
+    def __init__(self) -> None:
+        self._last: dict[Any, Any] = {}
+        self.published = 0
+        self.suppressed = 0
+
+    def changed(self, key: Any, fingerprint: Any) -> bool:
+        if self._last.get(key) == fingerprint:
+            self.suppressed += 1
+            return False
+        self._last[key] = fingerprint
+        self.published += 1
+        return True
+
+    def forget(self, key: Any) -> None:
+        self._last.pop(key, None)
+
+
+class DeltaRecorder:
+    """Writes snapshot changes as JSON lines: periodic keyframes plus field deltas.
+
+    Unchanged snapshots are not written at all. Every `keyframe_interval`
+    records per key a full keyframe is emitted so a reader can resync.
+    """
+
+    def __init__(self, stream: TextIO, *, keyframe_interval: int = 20) -> None:
+        self.stream = stream
+        self.keyframe_interval = keyframe_interval
+        self._last: dict[str, dict[str, OrderBookSnapshot]] = {}
+        self._since_keyframe: dict[str, int] = {}
+        self.keyframes = 0
+        self.deltas = 0
+        self.skipped = 0
+
+    def record(self, key: str, snapshots: Iterable[OrderBookSnapshot], *, timestamp: float | None = None) -> bool:
+        current = {snapshot.token_id: snapshot for snapshot in snapshots}
+        previous = self._last.get(key)
+        if previous == current:
+            self.skipped += 1
+            return False
+
+        ts = time.time() if timestamp is None else timestamp
+        needs_keyframe = (
+            previous is None
+            or previous.keys() != current.keys()
+            or self._since_keyframe[key] >= self.keyframe_interval
+        )
+        if needs_keyframe:
+            line = {"t": ts, "k": key, "kf": {token: _fields(snap) for token, snap in current.items()}}
+            self._since_keyframe[key] = 0
+            self.keyframes += 1
+        else:
+            delta = {}
+            for token, snap in current.items():
+                old_fields = _fields(previous[token])
+                changed = {name: value for name, value in _fields(snap).items() if value != old_fields[name]}
+                if changed:
+                    delta[token] = changed
+            line = {"t": ts, "k": key, "d": delta}
+            self.deltas += 1
+
+        self._since_keyframe[key] = self._since_keyframe.get(key, 0) + 1
+        self._last[key] = current
+        self.stream.write(json.dumps(line, separators=(",", ":")) + "\n")
+        return True
+
+
+def replay(lines: Iterable[str]) -> Iterator[tuple[float, str, list[OrderBookSnapshot]]]:
+    """Rebuild full snapshots from a `DeltaRecorder` log."""
+    state: dict[str, dict[str, dict[str, Any]]] = {}
+    for raw in lines:
+        if not raw.strip():
+            continue
+        line = json.loads(raw)
+        key = line["k"]
+        if "kf" in line:
+            state[key] = {token: dict(fields) for token, fields in line["kf"].items()}
+        elif key in state:
+            for token, fields in line["d"].items():
+                state[key][token].update(fields)
+        else:
+            continue
+        yield line["t"], key, [OrderBookSnapshot(token_id=token, **fields) for token, fields in state[key].items()]
+
+
+def _fields(snapshot: OrderBookSnapshot) -> dict[str, Any]:
+    return {name: getattr(snapshot, name) for name in SNAPSHOT_FIELDS}
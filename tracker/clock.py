@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable
+
+
+class ServerClock:
+    """Estimates server clock offset and RTT from HTTP `Date` headers.
+
+    Local time is a wall-clock anchor advanced by a monotonic clock, so wall
+    clock steps on the host do not move it. Each response bounds the offset:
+    the server stamped `Date` (1 s resolution) somewhere between send and
+    receive. Bounds from successive samples are intersected (widened by
+    `max_drift` per second elapsed) so the estimate tightens below one second
+    as samples land on different sub-second phases.
+
+    A sample whose bounds miss the estimate is counted as an outlier and
+    ignored (a stale cached `Date`, a stalled response). Only after
+    `reset_after` consecutive outliers that agree with each other is it
+    treated as a server clock step, and the bounds restart from them.
+    """
+
+    def __init__(
+        self,
+        *,
+        rtt_alpha: float = 0.2,
+        max_drift: float = 1e-4,
+        reset_after: int = 3,
+        wall: Callable[[], float] = time.time,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rtt_alpha = rtt_alpha
+        self.max_drift = max_drift
+        self.reset_after = reset_after
+        self._monotonic = monotonic
+        self._wall_anchor = wall()
+        self._mono_anchor = monotonic()
+        self._lock = threading.Lock()
+        self._low: float | None = None
+        self._high: float | None = None
+        self._bounds_at = 0.0
+        self._pending: tuple[float, float, float] | None = None
+        self._pending_count = 0
+        self.rtt: float | None = None
+        self.samples = 0
+        self.outliers = 0
+        self.resets = 0
+
+    def monotonic(self) -> float:
+        return self._monotonic()
+
+    def local_time(self, monotonic: float | None = None) -> float:
+        if monotonic is None:
+            monotonic = self._monotonic()
+        return self._wall_anchor + (monotonic - self._mono_anchor)
+
+    @property
+    def offset(self) -> float:
+        with self._lock:
+            if self._low is None or self._high is None:
+                return 0.0
+            return (self._low + self._high) / 2
+
+    @property
+    def uncertainty(self) -> float | None:
+        with self._lock:
+            if self._low is None or self._high is None:
+                return None
+            return (self._high - self._low) / 2
+
+    def now(self) -> float:
+        """Best estimate of the server's Unix time, in fractional seconds."""
+        return self.local_time() + self.offset
+
+    def observe(self, sent: float, received: float, server_time: float, *, resolution: float = 1.0) -> None:
+        """Feed one sample; `sent`/`received` are readings of `self.monotonic()`."""
+        low = server_time - self.local_time(received)
+        high = server_time + resolution - self.local_time(sent)
+        rtt = max(0.0, received - sent)
+
+        with self._lock:
+            self.samples += 1
+            self.rtt = rtt if self.rtt is None else self.rtt + self.rtt_alpha * (rtt - self.rtt)
+
+            if self._low is not None and self._high is not None:
+                merged = self._merge(self._low, self._high, self._bounds_at, low, high, received)
+                if merged is None:
+                    self._observe_outlier(low, high, received)
+                    return
+                low, high = merged
+
+            self._pending = None
+            self._pending_count = 0
+            self._low, self._high = low, high
+            self._bounds_at = received
+
+    def _merge(
+        self, low: float, high: float, at: float, new_low: float, new_high: float, received: float
+    ) -> tuple[float, float] | None:
+        """Intersect `(low, high)` set at `at`, widened by drift, with a new sample; None when disjoint."""
+        drift = self.max_drift * max(0.0, received - at)
+        merged_low = max(low - drift, new_low)
+        merged_high = min(high + drift, new_high)
+        return (merged_low, merged_high) if merged_low <= merged_high else None
+
+    def _observe_outlier(self, low: float, high: float, received: float) -> None:
+        """Caller holds the lock."""
+        self.outliers += 1
+        merged = None
+        if self._pending is not None:
+            merged = self._merge(*self._pending, low, high, received)
+        if merged is None:
+            self._pending_count = 0
+        else:
+            low, high = merged
+        self._pending = (low, high, received)
+        self._pending_count += 1
+
+        if self._pending_count >= self.reset_after:
+            self.resets += 1
+            self._low, self._high = low, high
+            self._bounds_at = received
+            self._pending = None
+            self._pending_count = 0
+
+    def observe_date_header(self, date_header: str | None, sent: float, received: float) -> bool:
+        if not date_header:
+            return False
+        try:
+            server_time = parsedate_to_datetime(date_header).timestamp()
+        except (TypeError, ValueError):
+            return False
+        self.observe(sent, received, server_time)
+        return True
+
+    def stats(self) -> dict[str, float | int | None]:
+        return {
+            "offset": self.offset,
+            "uncertainty": self.uncertainty,
+            "rtt": self.rtt,
+            "samples": self.samples,
+            "outliers": self.outliers,
+            "resets": self.resets,
+        }
+
+
+server_clock = ServerClock()
+
+
+def period_bounds(interval_seconds: float, *, now: float | None = None) -> tuple[float, float]:
+    if now is None:
+        now = server_clock.now()
+    start = now - (now % interval_seconds)
+    return start, start + interval_seconds
+
+
+def seconds_until(timestamp: float, *, clock: ServerClock | None = None) -> float:
+    return max(0.0, timestamp - (clock or server_clock).now())
@@ -1,5 +1,8 @@
-GAMMA_EVENTS_URL = "https://gamma-api.polymarket.com/events"
-CLOB_BOOK_URL = "https://clob.polymarket.com/book"
+import os
+
+GAMMA_EVENTS_URL = os.environ.get("POLYMARKET_GAMMA_EVENTS_URL", "https://gamma-api.polymarket.com/events")
+CLOB_BOOK_URL = os.environ.get("POLYMARKET_CLOB_BOOK_URL", "https://clob.polymarket.com/book")
 DEFAULT_TIMEOUT_SECONDS = 10.0
 DEFAULT_MAX_RETRIES = 4
 DEFAULT_BACKOFF_SECONDS = 1.25
+COALESCE_FRESHNESS_SECONDS = 0.25
@@ -7,6 +7,7 @@ from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+from tracker.clock import ServerClock, server_clock
 from tracker.config import DEFAULT_BACKOFF_SECONDS, DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT_SECONDS
 from tracker.errors import PolymarketAPIError
 
@@ -18,15 +19,19 @@ def request_json_with_retries(
     timeout: float = DEFAULT_TIMEOUT_SECONDS,
     max_retries: int = DEFAULT_MAX_RETRIES,
     backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    clock: ServerClock | None = None,
 ) -> Any:
     query = f"?{urlencode(params)}" if params else ""
     final_url = f"{url}{query}"
     last_error: Exception | None = None
+    clock = clock or server_clock
 
     for attempt in range(max_retries + 1):
         try:
             req = Request(final_url, headers={"User-Agent": "polymarket-tracker/1.0"})
+            sent = clock.monotonic()
             with urlopen(req, timeout=timeout) as response:
+                clock.observe_date_header(response.headers.get("Date"), sent, clock.monotonic())
                 payload = response.read().decode("utf-8")
                 return json.loads(payload)
         except HTTPError as exc:
@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(frozen=True)
 class OrderBookSnapshot:
     token_id: str
     last_trade_price: float | None
@@ -9,3 +9,26 @@ class OrderBookSnapshot:
     best_ask: float | None
     mid_price_probability: float | None
     spread: float | None
+
+    @property
+    def fingerprint(self) -> tuple[str, float | None, float | None, float | None]:
+        # Mid and spread derive from bid/ask, so top-of-book identifies the snapshot.
+        return (self.token_id, self.last_trade_price, self.best_bid, self.best_ask)
+
+
+@dataclass
+class ArbitrageOpportunity:
+    market_id: str
+    side: str
+    token_ids: tuple[str, str]
+    best_prices: tuple[float, float]
+    edge: float
+    size: float
+    expected_profit: float
+    levels: list[tuple[float, float, float]] = field(default_factory=list)
+    received_ns: int = 0
+    detected_ns: int = 0
+
+    @property
+    def detection_latency_ms(self) -> float:
+        return (self.detected_ns - self.received_ns) / 1_000_000
@@ -37,6 +37,18 @@ def extract_prices(levels: list[dict[str, Any]] | None) -> list[float]:
     return values
 
 
+def extract_levels(levels: list[dict[str, Any]] | None) -> list[tuple[float, float]]:
+    if not levels:
+        return []
+    values: list[tuple[float, float]] = []
+    for level in levels:
+        price = to_float(level.get("price"))
+        size = to_float(level.get("size"))
+        if price is not None and size is not None and size > 0:
+            values.append((price, size))
+    return values
+
+
 def normalize_binary_probabilities(prob_a: float | None, prob_b: float | None) -> tuple[float | None, float | None]:
     if prob_a is None and prob_b is None:
         return None, None
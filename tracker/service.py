@@ -1,16 +1,61 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from typing import Any
 
-from tracker.config import CLOB_BOOK_URL, GAMMA_EVENTS_URL
+from tracker.arbitrage import ComplementArbitrageScanner
+from tracker.config import CLOB_BOOK_URL, COALESCE_FRESHNESS_SECONDS, GAMMA_EVENTS_URL
 from tracker.errors import PolymarketAPIError
 from tracker.http_client import request_json_with_retries
 from tracker.models import OrderBookSnapshot
 from tracker.probability import extract_prices, normalize_binary_probabilities, parse_json_array, to_float
+from tracker.singleflight import SingleFlight
+
+# Decoded payloads are shared between coalesced callers: treat them as read-only.
+# Each entry is `(payload, received_ns)`, stamped with `time.perf_counter_ns()`
+# when the response arrived, so cached reuse keeps the original receive time.
+_single_flight = SingleFlight(freshness_seconds=COALESCE_FRESHNESS_SECONDS)
+
+
+def _fetch_key(url: str, params: dict[str, Any]) -> tuple[str, tuple[tuple[str, Any], ...]]:
+    return url, tuple(sorted(params.items()))
+
+
+def _request_stamped(url: str, params: dict[str, Any]) -> tuple[Any, int]:
+    payload = request_json_with_retries(url, params=params)
+    return payload, time.perf_counter_ns()
+
+
+def fetch_json_stamped(url: str, params: dict[str, Any]) -> tuple[Any, int]:
+    return _single_flight.do(_fetch_key(url, params), lambda: _request_stamped(url, params))
+
+
+async def fetch_json_stamped_async(url: str, params: dict[str, Any]) -> tuple[Any, int]:
+    return await _single_flight.do_async(_fetch_key(url, params), lambda: _request_stamped(url, params))
+
+
+def fetch_json(url: str, params: dict[str, Any]) -> Any:
+    return fetch_json_stamped(url, params)[0]
+
+
+async def fetch_json_async(url: str, params: dict[str, Any]) -> Any:
+    return (await fetch_json_stamped_async(url, params))[0]
+
+
+def get_fetch_metrics() -> dict[str, int]:
+    return _single_flight.stats()
 
 
 def get_market_data(slug: str) -> dict[str, Any]:
-    payload = request_json_with_retries(GAMMA_EVENTS_URL, params={"slug": slug})
+    return _parse_market_data(slug, fetch_json(GAMMA_EVENTS_URL, {"slug": slug}))
+
+
+async def get_market_data_async(slug: str) -> dict[str, Any]:
+    return _parse_market_data(slug, await fetch_json_async(GAMMA_EVENTS_URL, {"slug": slug}))
+
+
+def _parse_market_data(slug: str, payload: Any) -> dict[str, Any]:
     if not isinstance(payload, list) or not payload:
         raise PolymarketAPIError(f"No event found for slug={slug!r}")
 
@@ -44,9 +89,31 @@ def get_market_data(slug: str) -> dict[str, Any]:
     }
 
 
-def calculate_probability(token_id: str) -> OrderBookSnapshot:
-    payload = request_json_with_retries(CLOB_BOOK_URL, params={"token_id": token_id})
+def fetch_order_book(token_id: str) -> dict[str, Any]:
+    return fetch_order_book_stamped(token_id)[0]
 
+
+def fetch_order_book_stamped(token_id: str) -> tuple[dict[str, Any], int]:
+    payload, received_ns = fetch_json_stamped(CLOB_BOOK_URL, {"token_id": token_id})
+    return _check_order_book(token_id, payload), received_ns
+
+
+async def fetch_order_book_async(token_id: str) -> dict[str, Any]:
+    return (await fetch_order_book_stamped_async(token_id))[0]
+
+
+async def fetch_order_book_stamped_async(token_id: str) -> tuple[dict[str, Any], int]:
+    payload, received_ns = await fetch_json_stamped_async(CLOB_BOOK_URL, {"token_id": token_id})
+    return _check_order_book(token_id, payload), received_ns
+
+
+def _check_order_book(token_id: str, payload: Any) -> dict[str, Any]:
+    if not isinstance(payload, dict):
+        raise PolymarketAPIError(f"Invalid order book payload for token_id={token_id!r}")
+    return payload
+
+
+def snapshot_from_book(token_id: str, payload: dict[str, Any]) -> OrderBookSnapshot:
     bids = extract_prices(payload.get("bids"))
     asks = extract_prices(payload.get("asks"))
 
@@ -69,13 +136,47 @@ def calculate_probability(token_id: str) -> OrderBookSnapshot:
     )
 
 
-def collect_event_probabilities(slug: str) -> dict[str, Any]:
+def calculate_probability(token_id: str) -> OrderBookSnapshot:
+    return snapshot_from_book(token_id, fetch_order_book(token_id))
+
+
+def collect_event_probabilities(slug: str, *, scanner: ComplementArbitrageScanner | None = None) -> dict[str, Any]:
     market = get_market_data(slug)
     t0, t1 = market["token_ids"]
 
-    snap0 = calculate_probability(t0)
-    snap1 = calculate_probability(t1)
+    book0, received0 = fetch_order_book_stamped(t0)
+    book1, received1 = fetch_order_book_stamped(t1)
+    if scanner is not None:
+        scanner.track_pair(slug, t0, t1)
+        scanner.on_pair_update(slug, book0, book1, received_ns=received0, received_ns_b=received1)
+
+    return _build_event_probabilities(market, snapshot_from_book(t0, book0), snapshot_from_book(t1, book1))
+
+
+async def collect_event_probabilities_async(
+    slug: str,
+    *,
+    scanner: ComplementArbitrageScanner | None = None,
+) -> dict[str, Any]:
+    market = await get_market_data_async(slug)
+    t0, t1 = market["token_ids"]
+
+    (book0, received0), (book1, received1) = await asyncio.gather(
+        fetch_order_book_stamped_async(t0),
+        fetch_order_book_stamped_async(t1),
+    )
+    if scanner is not None:
+        scanner.track_pair(slug, t0, t1)
+        scanner.on_pair_update(slug, book0, book1, received_ns=received0, received_ns_b=received1)
+
+    return _build_event_probabilities(market, snapshot_from_book(t0, book0), snapshot_from_book(t1, book1))
+
 
+def _build_event_probabilities(
+    market: dict[str, Any],
+    snap0: OrderBookSnapshot,
+    snap1: OrderBookSnapshot,
+) -> dict[str, Any]:
     direct0, direct1 = normalize_binary_probabilities(snap0.last_trade_price, snap1.last_trade_price)
     mid0, mid1 = normalize_binary_probabilities(snap0.mid_price_probability, snap1.mid_price_probability)
 
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        self.waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future[Any]]] = []
+
+
+def _resolve(future: asyncio.Future[Any], call: _Call) -> None:
+    if future.done():
+        return
+    if call.error is not None:
+        future.set_exception(call.error)
+    else:
+        future.set_result(call.value)
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls sharing the same key.
+
+    The first caller for a key runs `fn`; callers arriving while it is in
+    flight receive the same result (or exception). Threaded followers block on
+    an event; async followers await a future on their own loop and hold no
+    worker thread. With a positive `freshness_seconds`, successful results are
+    also reused for that long.
+
+    Results are shared, not copied: every caller gets the same object, so
+    callers must treat it as read-only.
+    """
+
+    def __init__(self, *, freshness_seconds: float = 0.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.freshness_seconds = freshness_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._fresh: dict[Hashable, tuple[float, Any]] = {}
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0, "fresh_hits": 0}
+
+    def _join(self, key: Hashable) -> tuple[_Call | None, bool, Any]:
+        """Return `(call, is_leader, fresh_value)`; `call` is None on a fresh hit. Caller holds the lock."""
+        self._stats["calls"] += 1
+        fresh = self._fresh.get(key)
+        if fresh is not None and fresh[0] > self._clock():
+            self._stats["fresh_hits"] += 1
+            return None, False, fresh[1]
+
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _Call()
+            self._stats["executions"] += 1
+            return call, True, None
+        self._stats["coalesced"] += 1
+        return call, False, None
+
+    def _run(self, key: Hashable, call: _Call, fn: Callable[[], Any]) -> None:
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and self.freshness_seconds > 0:
+                    now = self._clock()
+                    self._fresh = {k: v for k, v in self._fresh.items() if v[0] > now}
+                    self._fresh[key] = (now + self.freshness_seconds, call.value)
+                waiters, call.waiters = call.waiters, []
+            call.done.set()
+            for loop, future in waiters:
+                try:
+                    loop.call_soon_threadsafe(_resolve, future, call)
+                except RuntimeError:
+                    pass  # loop already closed
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call, leader, fresh_value = self._join(key)
+        if call is None:
+            return fresh_value
+
+        if leader:
+            self._run(key, call, fn)
+        else:
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        with self._lock:
+            call, leader, fresh_value = self._join(key)
+            if call is not None:
+                call.waiters.append((loop, future))
+        if call is None:
+            return fresh_value
+
+        if leader:
+            # Only the leader occupies an executor thread for the blocking fetch.
+            loop.run_in_executor(None, self._run, key, call, fn)
+        return await future
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fresh.clear()
+            for key in self._stats:
+                self._stats[key] = 0
@@ -5,20 +5,24 @@ Versão STANDALONE - Não requer pytz, usa apenas biblioteca padrão do Python
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from tracker.clock import ServerClock, period_bounds, server_clock
+
 
 class SlugManager:
     """Gerencia a geração automática de slugs para mercados BTC de 5 minutos"""
     
-    def __init__(self, asset: str = "btc", interval_minutes: int = 5):
+    def __init__(self, asset: str = "btc", interval_minutes: int = 5, clock: Optional[ServerClock] = None):
         """
         Inicializa o gerenciador de slugs
         
         Args:
             asset: Ativo a ser monitorado (padrão: "btc")
             interval_minutes: Intervalo em minutos (padrão: 5)
+            clock: Relógio estimado do servidor (padrão: `tracker.clock.server_clock`)
         """
         self.asset = asset.lower()
         self.interval_minutes = interval_minutes
+        self.clock = clock or server_clock
         
         # Eastern Time é UTC-5 (EST) ou UTC-4 (EDT)
         # Vamos usar UTC-5 como padrão (ajuste se necessário para horário de verão)
@@ -36,7 +40,7 @@ class SlugManager:
         Se quiser suporte automático a horário de verão (EDT = UTC-4),
         instale pytz e use a versão original do código.
         """
-        utc_now = datetime.now(timezone.utc)
+        utc_now = datetime.fromtimestamp(self.clock.now(), timezone.utc)
         et_now = utc_now + self.et_offset
         return et_now
     
@@ -109,19 +113,18 @@ class SlugManager:
         
         return self._generate_slug(next_period_start)
     
-    def get_time_until_next_period(self) -> int:
+    def get_time_until_next_period(self) -> float:
         """
         Retorna quantos segundos faltam até o próximo período
         
+        Usa o relógio estimado do servidor, com precisão abaixo de 1 segundo.
+        
         Returns:
-            int: Segundos até a próxima atualização
+            float: Segundos até a próxima atualização
         """
-        now = self._get_current_et_time()
-        current_period_start = self._round_to_interval(now)
-        next_period_start = current_period_start + timedelta(minutes=self.interval_minutes)
-        
-        delta = next_period_start - now
-        return int(delta.total_seconds())
+        now = self.clock.now()
+        _, period_end = period_bounds(self.interval_minutes * 60, now=now)
+        return period_end - now
     
     def get_period_info(self) -> dict:
         """
@@ -173,7 +176,7 @@ if __name__ == "__main__":
     info = manager.get_period_info()
     print(f"Slug Atual: {info['slug']}")
     print(f"Período: {info['period_start'].strftime('%H:%M')} - {info['period_end'].strftime('%H:%M')} ET")
-    print(f"Tempo restante: {info['time_remaining']} segundos ({info['time_remaining']//60} minutos)")
+    print(f"Tempo restante: {info['time_remaining']:.1f} segundos ({int(info['time_remaining'] // 60)} minutos)")
     print(f"Próximo slug: {info['next_slug']}\n")
     
     # Simula verificação contínua (você rodaria isso no seu loop principal)